@@ -2,19 +2,32 @@
 
 from __future__ import annotations
 
-import csv
+import copy
 import math
-import statistics
-from dataclasses import dataclass
+import threading
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, fields, replace
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+import requests
 from binance.cm_futures import CMFutures
 from binance.spot import Spot
 
 from .binance_simulator import BinanceSimulator, DEFAULT_API_KEY, DEFAULT_SECRET_KEY
 
+_MS_PER_DAY = 86_400_000
+# A kline call costs at most 10 request-weight points, so a handful in flight stays far below
+# Binance's per-minute weight limit. Each worker thread talks through its own client copy
+# (see _clone_client) because requests.Session is not documented as thread-safe.
+_FETCH_WORKERS = 8
+
+# Daily closes per symbol, as (startTime, endTime, closes) for every window downloaded so far.
+_PriceCache = Dict[str, List[Tuple[int, int, Dict[date, float]]]]
+
 
 def _parse_date(value: str | date) -> date:
     if isinstance(value, date):
@@ -22,11 +35,16 @@ def _parse_date(value: str | date) -> date:
     return datetime.strptime(value, "%Y-%m-%d").date()
 
 
-def _date_range(start: date, end: date) -> Iterable[date]:
-    current = start
-    while current <= end:
-        yield current
-        current += timedelta(days=1)
+def _clone_client(client: Any) -> Any:
+    """Shallow copy of a Binance connector client that sends through its own ``requests.Session``."""
+
+    session = getattr(client, "session", None)
+    if not isinstance(session, requests.Session):
+        return client
+    clone = copy.copy(client)
+    clone.session = requests.Session()
+    clone.session.headers.update(session.headers)
+    return clone
 
 
 def _date_to_millis(day: date) -> int:
@@ -34,29 +52,72 @@ def _date_to_millis(day: date) -> int:
     return int(dt.timestamp() * 1000)
 
 
+def _segment_window(segment: Dict[str, Any]) -> Tuple[int, int]:
+    """Kline request window for a contract segment, padded by a day on each side."""
+
+    start_ms = _date_to_millis(segment["start"] - timedelta(days=1))
+    end_ms = _date_to_millis(segment["end"] + timedelta(days=1))
+    return start_ms, end_ms
+
+
 def _klines_to_daily_close(klines: List[List]) -> Dict[date, float]:
-    prices: Dict[date, float] = {}
-    for kline in klines:
-        day = datetime.fromtimestamp(kline[0] / 1000, tz=timezone.utc).date()
-        prices[day] = float(kline[4])
-    return prices
+    open_ms = np.fromiter((kline[0] for kline in klines), dtype=np.int64, count=len(klines))
+    closes = np.array([kline[4] for kline in klines], dtype=np.float64)
+    days = (open_ms // _MS_PER_DAY).astype("datetime64[D]")
+    return dict(zip(days.tolist(), closes.tolist()))
+
 
+def _quarterly_deliveries(earliest: date, latest: date) -> List[date]:
+    """Last Fridays of Mar/Jun/Sep/Dec falling within ``[earliest, latest]``."""
 
-def _last_friday(year: int, month: int) -> date:
-    if month == 12:
-        next_month = date(year + 1, 1, 1)
-    else:
-        next_month = date(year, month + 1, 1)
-    candidate = next_month - timedelta(days=1)
-    while candidate.weekday() != 4:
-        candidate -= timedelta(days=1)
-    return candidate
+    years = np.arange(earliest.year, latest.year + 1)
+    # Months since epoch of the month following each quarter-end month.
+    next_months = ((years[:, None] - 1970) * 12 + np.array([3, 6, 9, 12])).ravel()
+    month_ends = next_months.astype("datetime64[M]").astype("datetime64[D]") - 1
+    weekdays = (month_ends.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday.
+    deliveries = month_ends - (weekdays - 4) % 7
+    in_window = (deliveries >= np.datetime64(earliest, "D")) & (deliveries <= np.datetime64(latest, "D"))
+    return deliveries[in_window].tolist()
 
 
 def _format_delivery_symbol(pair: str, delivery: date) -> str:
     return f"{pair}_{delivery.strftime('%y%m%d')}"
 
 
+def _simulate_core(
+    spot: np.ndarray,
+    fut: np.ndarray,
+    seg_csize: np.ndarray,
+    sym_idx: np.ndarray,
+    notional: float,
+) -> Tuple[np.ndarray, ...]:
+    """Daily positions and PnL for aligned per-day price arrays.
+
+    ``sym_idx`` maps each day to its segment and ``seg_csize`` holds one contract
+    size per segment. A roll happens whenever ``sym_idx`` changes; both legs are
+    re-sized on the roll day at zero PnL and held flat until the next roll.
+    """
+
+    roll = np.concatenate(([True], sym_idx[1:] != sym_idx[:-1]))
+    roll_pos = np.flatnonzero(roll)
+    seg_len = np.diff(np.append(roll_pos, len(spot)))
+    csize = seg_csize[sym_idx[roll_pos]]
+    seg_contracts = np.maximum(1.0, np.rint(notional / csize))
+    spot_qty = np.repeat(notional / spot[roll_pos], seg_len)
+    contracts = np.repeat(seg_contracts, seg_len)
+    # Short face value (contracts * contractSize) is constant within a segment.
+    short_face = np.repeat(-1.0 * seg_contracts * csize, seg_len)
+
+    prev_spot = np.roll(spot, 1)
+    prev_fut = np.roll(fut, 1)
+    spot_pnl = np.where(roll, 0.0, spot_qty * (spot - prev_spot))
+    future_pnl_coin = short_face * (1.0 / prev_fut - 1.0 / fut)
+    future_pnl = np.where(roll, 0.0, future_pnl_coin * spot)
+    total = spot_pnl + future_pnl
+    cum_pnl = np.cumsum(total)
+    return spot_qty, contracts, spot_pnl, future_pnl, total, cum_pnl, roll
+
+
 @dataclass
 class BacktestConfig:
     start_date: date | str = "2021-01-01"
@@ -76,6 +137,26 @@ class BacktestConfig:
             self.output_path = Path(self.output_path)
 
 
+@dataclass
+class BacktestResult:
+    """Daily backtest output stored column-wise, one array per field."""
+
+    date: np.ndarray
+    spot_price: np.ndarray
+    future_symbol: np.ndarray
+    future_price: np.ndarray
+    spot_position: np.ndarray
+    future_contracts: np.ndarray
+    spot_pnl: np.ndarray
+    future_pnl: np.ndarray
+    total_pnl: np.ndarray
+    cum_pnl: np.ndarray
+    roll: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+
 class SpreadBacktester:
     """Download Binance data, roll contracts, and compute daily PnL."""
 
@@ -85,8 +166,13 @@ class SpreadBacktester:
         simulator: Optional[BinanceSimulator] = None,
         spot_client: Optional[Spot] = None,
         future_client: Optional[CMFutures] = None,
+        price_cache: Optional[_PriceCache] = None,
     ) -> None:
         self.config = config or BacktestConfig()
+        # Pass one cache to several backtesters so any request whose window is already
+        # covered by an earlier download is served from memory.
+        self.price_cache: _PriceCache = {} if price_cache is None else price_cache
+        self._worker = threading.local()
         if simulator:
             self.spot_client = simulator.spot
             self.future_client = simulator.cm_future
@@ -97,40 +183,61 @@ class SpreadBacktester:
             self.future_client = future_client or CMFutures(key=api_key, secret=api_secret)
 
     # ------------------------------ public ---------------------------------
-    def run(self) -> Tuple[List[Dict[str, float]], Dict[str, float]]:
-        spot_prices = self._fetch_spot_prices()
-        segments = self._build_contract_segments()
-        future_prices = self._fetch_future_prices(segments)
-        records = self._simulate(spot_prices, future_prices, segments)
-        summary = self._summarize(records)
+    def run(self) -> Tuple[BacktestResult, Dict[str, float]]:
+        return self._run()
+
+    def _run(self, segments: Optional[List[Dict[str, Any]]] = None) -> Tuple[BacktestResult, Dict[str, float]]:
+        with ThreadPoolExecutor(max_workers=_FETCH_WORKERS, initializer=self._init_fetch_worker) as pool:
+            spot_job = pool.submit(self._fetch_spot_prices)
+            if segments is None:
+                segments = self._build_contract_segments()
+            future_prices = self._fetch_future_prices(segments, pool)
+            spot_prices = spot_job.result()
+        result = self._simulate(spot_prices, future_prices, segments)
+        summary = self._summarize(result)
         target_path = self._resolve_output_path()
-        self._write_csv(records, target_path)
-        return records, summary
+        self._write_csv(result, target_path)
+        return result, summary
 
     # --------------------------- data fetch --------------------------------
+    def _init_fetch_worker(self) -> None:
+        self._worker.spot_client = _clone_client(self.spot_client)
+        self._worker.future_client = _clone_client(self.future_client)
+
+    def _spot_window(self) -> Tuple[int, int]:
+        return _date_to_millis(self.config.start_date), _date_to_millis(self.config.end_date + timedelta(days=1))
+
     def _fetch_spot_prices(self) -> Dict[date, float]:
-        params = {
-            "symbol": self.config.spot_symbol,
-            "interval": "1d",
-            "startTime": _date_to_millis(self.config.start_date),
-            "endTime": _date_to_millis(self.config.end_date + timedelta(days=1)),
-        }
-        klines = self.spot_client.klines(**params)
-        return _klines_to_daily_close(klines)
+        return self._fetch_daily_closes("spot_client", self.config.spot_symbol, *self._spot_window())
 
-    def _fetch_future_prices(self, segments: Iterable[Dict[str, Any]]) -> Dict[str, Dict[date, float]]:
-        prices: Dict[str, Dict[date, float]] = {}
-        for segment in segments:
-            symbol = segment["symbol"]
-            start_ms = _date_to_millis(segment["start"] - timedelta(days=1))
-            end_ms = _date_to_millis(segment["end"] + timedelta(days=1))
-            klines = self.future_client.klines(
-                symbol=symbol,
-                interval="1d",
-                startTime=start_ms,
-                endTime=end_ms,
-            )
-            prices[symbol] = _klines_to_daily_close(klines)
+    def _fetch_future_prices(
+        self,
+        segments: Iterable[Dict[str, Any]],
+        pool: Optional[Executor] = None,
+    ) -> Dict[str, Dict[date, float]]:
+        segments = list(segments)
+        fetch = pool.map if pool else map
+        closes = fetch(self._fetch_segment_prices, segments)
+        return {segment["symbol"]: prices for segment, prices in zip(segments, closes)}
+
+    def _fetch_segment_prices(self, segment: Dict[str, Any]) -> Dict[date, float]:
+        return self._fetch_daily_closes("future_client", segment["symbol"], *_segment_window(segment))
+
+    def _fetch_daily_closes(
+        self,
+        client_name: str,
+        symbol: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> Dict[date, float]:
+        for cached_start, cached_end, prices in self.price_cache.get(symbol, ()):
+            if cached_start <= start_ms and end_ms <= cached_end:
+                return prices
+        # Pool workers use their own client copy; other threads use the shared client.
+        client = getattr(self._worker, client_name, None) or getattr(self, client_name)
+        klines = client.klines(symbol=symbol, interval="1d", startTime=start_ms, endTime=end_ms)
+        prices = _klines_to_daily_close(klines)
+        self.price_cache.setdefault(symbol, []).append((start_ms, end_ms, prices))
         return prices
 
     def _build_contract_segments(self) -> List[Dict[str, Any]]:
@@ -141,16 +248,7 @@ class SpreadBacktester:
 
         earliest = self.config.start_date - timedelta(days=365)
         latest = self.config.end_date + timedelta(days=365)
-        deliveries: List[date] = []
-        for year in range(earliest.year, latest.year + 1):
-            for month in (3, 6, 9, 12):
-                delivery = _last_friday(year, month)
-                if delivery < earliest or delivery > latest:
-                    continue
-                deliveries.append(delivery)
-        deliveries = sorted(set(deliveries))
-
-        for delivery in deliveries:
+        for delivery in _quarterly_deliveries(earliest, latest):
             roll_date = delivery - timedelta(days=self.config.roll_buffer_days)
             start = cursor
             end = min(roll_date, end_date)
@@ -205,79 +303,71 @@ class SpreadBacktester:
         spot_prices: Dict[date, float],
         future_prices: Dict[str, Dict[date, float]],
         segments: List[Dict[str, Any]],
-    ) -> List[Dict[str, float]]:
-        day_to_symbol: Dict[date, str] = {}
-        segment_meta: Dict[str, Dict[str, Any]] = {}
-        for segment in segments:
-            day = segment["start"]
-            while day <= segment["end"]:
-                day_to_symbol[day] = segment["symbol"]
-                day += timedelta(days=1)
-            segment_meta[segment["symbol"]] = segment
-
-        prev_spot_price: Optional[float] = None
-        prev_future_price: Optional[float] = None
-        prev_symbol: Optional[str] = None
-        spot_qty: Optional[float] = None
-        contracts: Optional[int] = None
-        cum_pnl = 0.0
-        records: List[Dict[str, float]] = []
-        for day in _date_range(self.config.start_date, self.config.end_date):
+    ) -> BacktestResult:
+        start = self.config.start_date
+        dates = np.arange(
+            np.datetime64(start, "D"),
+            np.datetime64(self.config.end_date, "D") + 1,
+            dtype="datetime64[D]",
+        )
+        days: List[date] = dates.tolist()
+        sym_idx = np.full(len(days), -1, dtype=np.int16)
+        fut = np.empty(len(days), dtype=np.float64)
+        for idx, segment in enumerate(segments):
+            symbol = segment["symbol"]
+            closes = future_prices[symbol]
+            lo = (segment["start"] - start).days
+            hi = (segment["end"] - start).days + 1
+            segment_px: List[float] = []
+            for day in days[lo:hi]:
+                future_price = closes.get(day)
+                if future_price is None:
+                    raise RuntimeError(f"Missing future price for {symbol} on {day}.")
+                segment_px.append(future_price)
+            sym_idx[lo:hi] = idx
+            fut[lo:hi] = segment_px
+
+        uncovered = np.flatnonzero(sym_idx < 0)
+        if uncovered.size:
+            raise RuntimeError(f"Missing price data for {days[uncovered[0]]}.")
+        spot_px: List[float] = []
+        for day in days:
             spot_price = spot_prices.get(day)
-            symbol = day_to_symbol.get(day)
-            if spot_price is None or symbol is None:
+            if spot_price is None:
                 raise RuntimeError(f"Missing price data for {day}.")
-            future_price = future_prices[symbol].get(day)
-            if future_price is None:
-                raise RuntimeError(f"Missing future price for {symbol} on {day}.")
-
-            roll = symbol != prev_symbol or prev_spot_price is None
-            if roll:
-                spot_qty = self.config.notional_usdt / spot_price
-                contract_size = segment_meta[symbol]["contractSize"]
-                contracts = max(1, round(self.config.notional_usdt / contract_size))
-                spot_pnl = 0.0
-                future_pnl = 0.0
-            else:
-                spot_pnl = (spot_qty or 0.0) * (spot_price - (prev_spot_price or spot_price))
-                contract_size = segment_meta[symbol]["contractSize"]
-                future_pnl_coin = -1.0 * (contracts or 0) * contract_size * (
-                    1.0 / (prev_future_price or future_price) - 1.0 / future_price
-                )
-                future_pnl = future_pnl_coin * spot_price
-
-            total = spot_pnl + future_pnl
-            cum_pnl += total
-            records.append(
-                {
-                    "date": day.isoformat(),
-                    "spot_price": spot_price,
-                    "future_symbol": symbol,
-                    "future_price": future_price,
-                    "spot_position": spot_qty or 0.0,
-                    "future_contracts": float(contracts or 0),
-                    "spot_pnl": spot_pnl,
-                    "future_pnl": future_pnl,
-                    "total_pnl": total,
-                    "cum_pnl": cum_pnl,
-                    "roll": roll,
-                }
-            )
-            prev_spot_price = spot_price
-            prev_future_price = future_price
-            prev_symbol = symbol
-        return records
+            spot_px.append(spot_price)
+        spot = np.asarray(spot_px, dtype=np.float64)
+
+        symbols = np.array([segment["symbol"] for segment in segments])
+        seg_csize = np.array([segment["contractSize"] for segment in segments], dtype=np.float64)
+        spot_qty, contracts, spot_pnl, future_pnl, total, cum_pnl, roll = _simulate_core(
+            spot, fut, seg_csize, sym_idx, self.config.notional_usdt
+        )
+
+        return BacktestResult(
+            date=dates,
+            spot_price=spot,
+            future_symbol=symbols[sym_idx],
+            future_price=fut,
+            spot_position=spot_qty,
+            future_contracts=contracts,
+            spot_pnl=spot_pnl,
+            future_pnl=future_pnl,
+            total_pnl=total,
+            cum_pnl=cum_pnl,
+            roll=roll,
+        )
 
     # --------------------------- reporting ---------------------------------
-    def _summarize(self, records: List[Dict[str, float]]) -> Dict[str, float]:
-        if not records:
+    def _summarize(self, result: BacktestResult) -> Dict[str, float]:
+        if not len(result):
             return {}
-        total_days = len(records)
-        final_pnl = records[-1]["cum_pnl"]
+        total_days = len(result)
+        final_pnl = float(result.cum_pnl[-1])
         total_return = final_pnl / self.config.notional_usdt
         annualized_return = (1 + total_return) ** (365 / total_days) - 1 if total_days else 0.0
-        daily_returns = [rec["total_pnl"] / self.config.notional_usdt for rec in records[1:]]
-        daily_vol = statistics.pstdev(daily_returns) if len(daily_returns) > 1 else 0.0
+        daily_returns = result.total_pnl[1:] / self.config.notional_usdt
+        daily_vol = float(daily_returns.std(ddof=0)) if daily_returns.size > 1 else 0.0
         annualized_vol = daily_vol * math.sqrt(365)
         sharpe = annualized_return / annualized_vol if annualized_vol else float("nan")
         return {
@@ -289,12 +379,82 @@ class SpreadBacktester:
             "sharpe": sharpe,
         }
 
-    def _write_csv(self, records: List[Dict[str, float]], path: Path) -> None:
+    def _write_csv(self, result: BacktestResult, path: Path) -> None:
+        columns = [field.name for field in fields(result)]
+        rows = zip(*(getattr(result, name).tolist() for name in columns))
+        lines = [",".join(columns)]
+        lines.extend(",".join(map(str, row)) for row in rows)
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", newline="") as handle:
-            writer = csv.DictWriter(handle, fieldnames=list(records[0].keys()))
-            writer.writeheader()
-            writer.writerows(records)
+        path.write_text("\r\n".join(lines) + "\r\n", newline="")
+
+
+def _prefetch_klines(backtesters: List[SpreadBacktester], segment_lists: List[List[Dict[str, Any]]]) -> None:
+    """Download every kline window a grid needs in one concurrent batch.
+
+    Futures windows are merged per contract; a quarterly contract spans about 90
+    days, well inside the per-request kline limit. Spot windows are only
+    deduplicated, since merging different date ranges could exceed that limit.
+    """
+
+    spot_windows = {(bt.config.spot_symbol, *bt._spot_window()) for bt in backtesters}
+    spot_windows = {
+        (symbol, lo, hi)
+        for symbol, lo, hi in spot_windows
+        if not any(
+            other != (symbol, lo, hi) and other[0] == symbol and other[1] <= lo and hi <= other[2]
+            for other in spot_windows
+        )
+    }
+    future_windows: Dict[str, Tuple[int, int]] = {}
+    for segments in segment_lists:
+        for segment in segments:
+            lo, hi = _segment_window(segment)
+            merged = future_windows.get(segment["symbol"])
+            if merged is not None:
+                lo, hi = min(merged[0], lo), max(merged[1], hi)
+            future_windows[segment["symbol"]] = (lo, hi)
+
+    # Every backtester in a grid shares the same clients and cache, so any of them can fetch.
+    lead = backtesters[0]
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS, initializer=lead._init_fetch_worker) as pool:
+        jobs = [pool.submit(lead._fetch_daily_closes, "spot_client", *window) for window in spot_windows]
+        jobs += [
+            pool.submit(lead._fetch_daily_closes, "future_client", symbol, lo, hi)
+            for symbol, (lo, hi) in future_windows.items()
+        ]
+        for job in jobs:
+            job.result()
+
+
+def run_grid(
+    configs: Iterable[BacktestConfig],
+    simulator: Optional[BinanceSimulator] = None,
+) -> List[Tuple[BacktestResult, Dict[str, float]]]:
+    """Backtest several configs on one shared, concurrently downloaded price set.
+
+    Each futures contract is fetched once over the union of the windows the configs
+    need; the per-config simulations then run one after another from memory.
+    Configs that would write to the same CSV (e.g. a notional sweep over one date
+    window) get their grid index appended to the file name, so every run keeps its
+    own result file.
+    """
+
+    simulator = simulator or BinanceSimulator()
+    price_cache: _PriceCache = {}
+    backtesters = [
+        SpreadBacktester(config=config, simulator=simulator, price_cache=price_cache) for config in configs
+    ]
+    if not backtesters:
+        return []
+    targets = [backtester._resolve_output_path() for backtester in backtesters]
+    shared = {target for target, count in Counter(targets).items() if count > 1}
+    for idx, (backtester, target) in enumerate(zip(backtesters, targets)):
+        if target in shared:
+            unique = target.with_name(f"{target.stem}_{idx:03d}{target.suffix}")
+            backtester.config = replace(backtester.config, output_path=unique)
+    segment_lists = [backtester._build_contract_segments() for backtester in backtesters]
+    _prefetch_klines(backtesters, segment_lists)
+    return [backtester._run(segments) for backtester, segments in zip(backtesters, segment_lists)]
 
 
 def run_example() -> None:
@@ -27,15 +27,16 @@ class BinanceSimulator:
     order_fill_prob: float = 0.9
     spot_client: Optional[Spot] = None
     future_client: Optional[CMFutures] = None
+    seed: Optional[int] = None
 
     def __post_init__(self) -> None:
         self.spot = self.spot_client or Spot(api_key=self.api_key, api_secret=self.secret_key)
         self.cm_future = self.future_client or CMFutures(key=self.api_key, secret=self.secret_key)
+        # Private generator (seedable for reproducible runs); fills are a 16-bit integer draw.
+        self._rng = random.Random(self.seed)
 
     def place_order(self, order_params: Dict[str, Any]) -> Dict[str, Any]:
         """Mimic order placement with a simple fill probability."""
 
-        response = order_params.copy()
-        fill = random.random() <= self.order_fill_prob
-        response["status"] = "FILLED" if fill else "CANCELED"
-        return response
+        fill = self._rng.getrandbits(16) < int(self.order_fill_prob * (1 << 16))
+        return {**order_params, "status": "FILLED" if fill else "CANCELED"}
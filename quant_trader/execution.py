@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import argparse
 import logging
 import math
 import time
+import weakref
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from binance.cm_futures import CMFutures
 from binance.spot import Spot
@@ -16,14 +18,59 @@ from .binance_simulator import BinanceSimulator
 logger = logging.getLogger(__name__)
 
 
-def _round_to_step(value: float, step: float) -> float:
+def _step_precision(step: float) -> int:
+    if step == 0:
+        return 0
+    return max(0, int(round(-math.log10(step))))
+
+
+def _round_to_step(value: float, step: float, precision: int) -> float:
     if step == 0:
         return value
-    precision = max(0, int(round(-math.log10(step))))
     rounded = math.floor(value / step) * step
     return round(rounded, precision)
 
 
+def _sleep_until(deadline: float) -> None:
+    """Block until the ``time.monotonic()`` deadline; returns at once if it has passed."""
+
+    time.sleep(max(0.0, deadline - time.monotonic()))
+
+
+def _plan_slice_sizes(
+    spot_notional_remaining: float,
+    future_notional_remaining: float,
+    slices_left: int,
+    spot_price: float,
+    contract_size: float,
+) -> Tuple[float, float]:
+    """Split the remaining USD notional evenly and convert it to spot qty / contracts."""
+
+    planned_spot_qty = spot_notional_remaining / slices_left / spot_price
+    planned_future_contracts = future_notional_remaining / slices_left / contract_size
+    return planned_spot_qty, planned_future_contracts
+
+
+_EXCHANGE_INFO_TTL_SECONDS = 24 * 60 * 60
+# Weak keys so a cached snapshot never keeps a client (and its HTTP session) alive.
+_exchange_info_cache: "weakref.WeakKeyDictionary[Any, Tuple[float, Dict[str, Dict[str, Any]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _exchange_symbols(client: Any, max_age: float = _EXCHANGE_INFO_TTL_SECONDS) -> Dict[str, Dict[str, Any]]:
+    """Return ``exchange_info`` symbols indexed by name, refetching once older than ``max_age`` seconds."""
+
+    now = time.monotonic()
+    cached = _exchange_info_cache.get(client)
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+    info = client.exchange_info()
+    symbols = {symbol["symbol"]: symbol for symbol in info["symbols"]}
+    _exchange_info_cache[client] = (now, symbols)
+    return symbols
+
+
 @dataclass
 class ExecutionConfig:
     """Configuration for the TWAP style execution."""
@@ -35,6 +82,7 @@ class ExecutionConfig:
     min_spot_qty: float = 0.0001
     dry_run: bool = True
     use_market_orders: bool = True
+    book_ttl_seconds: float = 0.2
 
     @property
     def num_slices(self) -> int:
@@ -54,12 +102,13 @@ class SimpleOrderExecutor:
         self.future_client = future_client
 
     def place_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
-        payload = order.copy()
-        account = payload.pop("account")
+        """Route ``order`` to its account; ``order`` is consumed (``account`` is popped)."""
+
+        account = order.pop("account")
         if account == "SPOT":
-            return self.spot_client.new_order(**payload)
+            return self.spot_client.new_order(**order)
         if account == "FUTURE":
-            return self.future_client.new_order(**payload)
+            return self.future_client.new_order(**order)
         raise ValueError(f"Unknown account {account}")
 
 
@@ -94,37 +143,44 @@ class SpreadExecutor:
         self._spot_filter = self._load_spot_filters()
         self._future_filter = self._load_future_filters()
         self.contract_size = float(self._future_filter["contractSize"])
+        future_step = self._future_filter["stepSize"]
+        self._future_is_integer_step = future_step >= 1.0 and float(future_step).is_integer()
+        self._future_step_int = int(self._future_filter["stepSize"])
+        self._update_price_factors()
+        self._book_cache: Dict[str, Tuple[float, float, float]] = {}
 
     # -------------------------- public API ---------------------------------
     def open_position(self) -> None:
         """Open the spread by buying spot and selling futures via TWAP."""
 
-        _, spot_ask = self._spot_best_prices()
-        approx_spot_qty = self.config.notional_usdt / spot_ask if spot_ask else 0.0
-        approx_contracts = self.config.notional_usdt / self.contract_size
-        logger.info(
-            "Opening spread for %.2f USDT (~%.6f %s, %.2f %s) via %.0f slices (contractSize=%s).",
-            self.config.notional_usdt,
-            approx_spot_qty,
-            self.spot_symbol,
-            approx_contracts,
-            self.future_symbol,
-            self.config.num_slices,
-            self.contract_size,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            _, spot_ask = self._spot_best_prices()
+            approx_spot_qty = self.config.notional_usdt / spot_ask if spot_ask else 0.0
+            approx_contracts = self.config.notional_usdt / self.contract_size
+            logger.info(
+                "Opening spread for %.2f USDT (~%.6f %s, %.2f %s) via %.0f slices (contractSize=%s).",
+                self.config.notional_usdt,
+                approx_spot_qty,
+                self.spot_symbol,
+                approx_contracts,
+                self.future_symbol,
+                self.config.num_slices,
+                self.contract_size,
+            )
         self._run_twap_open("BUY", "SELL")
 
     def close_position(self, spot_qty: float, futures_contracts: int) -> None:
         """Close an existing spread by unwinding both legs."""
 
-        logger.info(
-            "Closing spread: %.4f %s, %s contracts %s via %.0f slices.",
-            spot_qty,
-            self.spot_symbol,
-            futures_contracts,
-            self.future_symbol,
-            self.config.num_slices,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Closing spread: %.4f %s, %s contracts %s via %.0f slices.",
+                spot_qty,
+                self.spot_symbol,
+                futures_contracts,
+                self.future_symbol,
+                self.config.num_slices,
+            )
         self._run_twap_close("SELL", "BUY", spot_qty, futures_contracts)
 
     # -------------------------- helpers ------------------------------------
@@ -133,8 +189,8 @@ class SpreadExecutor:
         future_notional_remaining = float(self.config.notional_usdt)
         slices = self.config.num_slices
 
-        start_time = time.time()
-        next_run = start_time
+        log_slices = logger.isEnabledFor(logging.INFO)
+        next_run = time.monotonic()
 
         for idx in range(slices):
             slices_left = max(1, slices - idx)
@@ -144,12 +200,11 @@ class SpreadExecutor:
                 logger.warning("Spot price unavailable; skipping slice %d.", idx + 1)
                 continue
 
-            planned_spot_notional = spot_notional_remaining / slices_left
-            planned_spot_qty = planned_spot_notional / spot_price
+            planned_spot_qty, planned_future_contracts = _plan_slice_sizes(
+                spot_notional_remaining, future_notional_remaining, slices_left, spot_price, self.contract_size
+            )
 
             future_bid, future_ask = self._future_best_prices()
-            planned_future_notional = future_notional_remaining / slices_left
-            planned_future_contracts = planned_future_notional / self.contract_size
 
             spot_size = self._place_spot_slice(spot_side, planned_spot_qty, spot_bid, spot_ask)
             future_size = self._place_future_slice(future_side, planned_future_contracts, future_bid, future_ask)
@@ -160,17 +215,17 @@ class SpreadExecutor:
             spot_notional_remaining = max(0.0, spot_notional_remaining - executed_spot_notional)
             future_notional_remaining = max(0.0, future_notional_remaining - executed_future_notional)
 
-            logger.info(
-                "Slice %03d/%03d complete. Spot remaining: %.2f USDT, Futures remaining: %.2f USDT.",
-                idx + 1,
-                slices,
-                spot_notional_remaining,
-                future_notional_remaining,
-            )
+            if log_slices:
+                logger.info(
+                    "Slice %03d/%03d complete. Spot remaining: %.2f USDT, Futures remaining: %.2f USDT.",
+                    idx + 1,
+                    slices,
+                    spot_notional_remaining,
+                    future_notional_remaining,
+                )
             if not self.config.dry_run and idx + 1 < slices:
                 next_run += self.config.slice_interval_seconds
-                sleep_for = max(0.0, next_run - time.time())
-                time.sleep(sleep_for)
+                _sleep_until(next_run)
 
         if spot_notional_remaining > 1.0 or future_notional_remaining > 1.0:
             logger.warning(
@@ -190,8 +245,8 @@ class SpreadExecutor:
         future_remaining = max(0.0, future_target_contracts)
         slices = self.config.num_slices
 
-        start_time = time.time()
-        next_run = start_time
+        log_slices = logger.isEnabledFor(logging.INFO)
+        next_run = time.monotonic()
 
         for idx in range(slices):
             slices_left = max(1, slices - idx)
@@ -206,17 +261,17 @@ class SpreadExecutor:
             spot_qty_remaining = max(0.0, spot_qty_remaining - spot_size)
             future_remaining = max(0.0, future_remaining - future_size)
 
-            logger.info(
-                "Slice %03d/%03d complete. Spot remaining: %.6f BTC, Futures remaining: %.2f contracts.",
-                idx + 1,
-                slices,
-                spot_qty_remaining,
-                future_remaining,
-            )
+            if log_slices:
+                logger.info(
+                    "Slice %03d/%03d complete. Spot remaining: %.6f BTC, Futures remaining: %.2f contracts.",
+                    idx + 1,
+                    slices,
+                    spot_qty_remaining,
+                    future_remaining,
+                )
             if not self.config.dry_run and idx + 1 < slices:
                 next_run += self.config.slice_interval_seconds
-                sleep_for = max(0.0, next_run - time.time())
-                time.sleep(sleep_for)
+                _sleep_until(next_run)
 
         if spot_qty_remaining > 1e-6 or future_remaining > 1e-6:
             logger.warning(
@@ -226,22 +281,27 @@ class SpreadExecutor:
             )
 
     def _spot_best_prices(self) -> Tuple[float, float]:
-        book = self.spot_client.book_ticker(self.spot_symbol)
-        bid = float(book["bidPrice"])
-        ask = float(book["askPrice"])
-        return bid, ask
+        return self._cached_best_prices(self.spot_symbol, lambda: self.spot_client.book_ticker(self.spot_symbol))
 
     def _future_best_prices(self) -> Tuple[float, float]:
-        book = self._future_book_ticker()
+        return self._cached_best_prices(self.future_symbol, self._future_book_ticker)
+
+    def _cached_best_prices(self, symbol: str, fetch: Callable[[], Dict[str, Any]]) -> Tuple[float, float]:
+        now = time.monotonic()
+        cached = self._book_cache.get(symbol)
+        if cached is not None and now - cached[2] < self.config.book_ttl_seconds:
+            return cached[0], cached[1]
+        book = fetch()
         bid = float(book["bidPrice"])
         ask = float(book["askPrice"])
+        self._book_cache[symbol] = (bid, ask, now)
         return bid, ask
 
     def _place_spot_slice(self, side: str, target_qty: float, best_bid: float, best_ask: float) -> float:
         if target_qty <= 0:
             return 0.0
         min_qty = max(self.config.min_spot_qty, self._spot_filter["minQty"])
-        clip = _round_to_step(target_qty, self._spot_filter["stepSize"])
+        clip = _round_to_step(target_qty, self._spot_filter["stepSize"], self._spot_filter["stepPrecision"])
         if clip < min_qty:
             return 0.0
 
@@ -254,7 +314,9 @@ class SpreadExecutor:
                 "quantity": clip,
             }
         else:
-            price = self._limit_price(side, best_bid, best_ask, self._spot_filter["tickSize"])
+            price = self._limit_price(
+                side, best_bid, best_ask, self._spot_filter["tickSize"], self._spot_filter["tickPrecision"]
+            )
             order = {
                 "symbol": self.spot_symbol,
                 "account": "SPOT",
@@ -270,13 +332,15 @@ class SpreadExecutor:
     def _place_future_slice(self, side: str, target_contracts: float, best_bid: float, best_ask: float) -> float:
         if target_contracts <= 0:
             return 0.0
-        step = self._future_filter["stepSize"]
-        min_contract = max(step, 1.0 if step >= 1.0 else step)
-        clip = _round_to_step(target_contracts, step)
-        if clip < min_contract:
-            return 0.0
-
-        quantity = int(clip) if step >= 1.0 else clip
+        if self._future_is_integer_step:
+            quantity = (int(target_contracts) // self._future_step_int) * self._future_step_int
+            if quantity < self._future_step_int:
+                return 0.0
+        else:
+            step = self._future_filter["stepSize"]
+            quantity = _round_to_step(target_contracts, step, self._future_filter["stepPrecision"])
+            if quantity < step:
+                return 0.0
 
         if self.config.use_market_orders:
             order = {
@@ -287,7 +351,9 @@ class SpreadExecutor:
                 "quantity": quantity,
             }
         else:
-            price = self._limit_price(side, best_bid, best_ask, self._future_filter["tickSize"])
+            price = self._limit_price(
+                side, best_bid, best_ask, self._future_filter["tickSize"], self._future_filter["tickPrecision"]
+            )
             order = {
                 "symbol": self.future_symbol,
                 "account": "FUTURE",
@@ -298,7 +364,7 @@ class SpreadExecutor:
                 "price": price,
             }
         self._submit_order(order)
-        return clip
+        return quantity
 
     def _submit_order(self, order: Dict[str, Any]) -> None:
         if self.config.dry_run:
@@ -309,36 +375,42 @@ class SpreadExecutor:
 
     # ----------------------- instrument metadata ---------------------------
     def _load_spot_filters(self) -> Dict[str, float]:
-        info = self.spot_client.exchange_info()
-        for symbol in info["symbols"]:
-            if symbol["symbol"] == self.spot_symbol:
-                filters = {f["filterType"]: f for f in symbol["filters"]}
-                lot = float(filters["LOT_SIZE"]["stepSize"])
-                tick = float(filters["PRICE_FILTER"]["tickSize"])
-                min_qty = float(filters["LOT_SIZE"]["minQty"])
-                return {"stepSize": lot, "tickSize": tick, "minQty": min_qty}
-        raise ValueError(f"Spot symbol {self.spot_symbol} missing in exchange info.")
+        symbol = _exchange_symbols(self.spot_client).get(self.spot_symbol)
+        if symbol is None:
+            raise ValueError(f"Spot symbol {self.spot_symbol} missing in exchange info.")
+        filters = {f["filterType"]: f for f in symbol["filters"]}
+        lot = float(filters["LOT_SIZE"]["stepSize"])
+        tick = float(filters["PRICE_FILTER"]["tickSize"])
+        min_qty = float(filters["LOT_SIZE"]["minQty"])
+        return {
+            "stepSize": lot,
+            "tickSize": tick,
+            "minQty": min_qty,
+            "stepPrecision": _step_precision(lot),
+            "tickPrecision": _step_precision(tick),
+        }
 
     def _load_future_filters(self) -> Dict[str, float]:
-        info = self.future_client.exchange_info()
-        for symbol in info["symbols"]:
-            if symbol["symbol"] == self.future_symbol:
-                filters = {f["filterType"]: f for f in symbol["filters"]}
-                lot = float(filters["LOT_SIZE"]["stepSize"])
-                tick = float(filters["PRICE_FILTER"]["tickSize"])
-                return {
-                    "stepSize": lot,
-                    "tickSize": tick,
-                    "contractSize": float(symbol["contractSize"]),
-                    "deliveryDate": int(symbol["deliveryDate"]),
-                }
-        raise ValueError(f"Future symbol {self.future_symbol} missing in exchange info.")
+        symbol = _exchange_symbols(self.future_client).get(self.future_symbol)
+        if symbol is None:
+            raise ValueError(f"Future symbol {self.future_symbol} missing in exchange info.")
+        filters = {f["filterType"]: f for f in symbol["filters"]}
+        lot = float(filters["LOT_SIZE"]["stepSize"])
+        tick = float(filters["PRICE_FILTER"]["tickSize"])
+        return {
+            "stepSize": lot,
+            "tickSize": tick,
+            "stepPrecision": _step_precision(lot),
+            "tickPrecision": _step_precision(tick),
+            "contractSize": float(symbol["contractSize"]),
+            "deliveryDate": int(symbol["deliveryDate"]),
+        }
 
     def _select_front_contract(self) -> str:
-        info = self.future_client.exchange_info()
         now = int(time.time() * 1000)
         candidates = []
-        for symbol in info["symbols"]:
+        # Always refresh here: listings and contract status change as quarters roll.
+        for symbol in _exchange_symbols(self.future_client, max_age=0.0).values():
             if symbol["pair"] != self.future_pair or symbol["contractType"] == "PERPETUAL":
                 continue
             status = symbol.get("status") or symbol.get("contractStatus")
@@ -353,14 +425,17 @@ class SpreadExecutor:
         return candidates[0]["symbol"]
 
     # ----------------------- price helpers ---------------------------------
-    def _limit_price(self, side: str, bid: float, ask: float, tick_size: float) -> float:
-        offset = self.config.price_offset_bps / 10_000.0
-        if side == "BUY":
-            price = min(ask * (1 + offset), ask * 1.001)
-        else:
-            price = max(bid * (1 - offset), bid * 0.999)
-        price = _round_to_step(price, tick_size)
-        return price
+    def _limit_price(self, side: str, bid: float, ask: float, tick_size: float, tick_precision: int) -> float:
+        if self.config.price_offset_bps != self._px_factor_offset:
+            self._update_price_factors()
+        price = ask * self._buy_px_factor if side == "BUY" else bid * self._sell_px_factor
+        return _round_to_step(price, tick_size, tick_precision)
+
+    def _update_price_factors(self) -> None:
+        self._px_factor_offset = self.config.price_offset_bps
+        offset = self._px_factor_offset / 10_000.0
+        self._buy_px_factor = min(1 + offset, 1.001)
+        self._sell_px_factor = max(1 - offset, 0.999)
 
     def _future_book_ticker(self) -> Dict[str, Any]:
         """Return a normalized best bid/ask snapshot for the current future symbol."""
@@ -379,10 +454,11 @@ class SpreadExecutor:
         return data
 
 
-def run_example() -> None:
+def run_example(quiet: bool = False) -> None:
     """Small helper to demonstrate how to open and close the spread."""
 
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    level = logging.WARNING if quiet else logging.INFO
+    logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(message)s")
     simulator = BinanceSimulator()
     executor = SpreadExecutor("BTCUSDT", future_pair="BTCUSD", simulator=simulator)
     executor.config.dry_run = True
@@ -395,4 +471,6 @@ def run_example() -> None:
 
 
 if __name__ == "__main__":
-    run_example()
+    parser = argparse.ArgumentParser(description="Run the dry-run TWAP spread example.")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings and errors.")
+    run_example(quiet=parser.parse_args().quiet)